@@ -1,71 +1,338 @@
 import pytest
+import hashlib
+import json
 import logging
 import os
 import time
 from datetime import datetime
-from playwright.sync_api import sync_playwright
+from pathlib import Path
+from playwright.sync_api import Error as PlaywrightError, sync_playwright
+from pages.base_page import APP_URL, BASE_URL
+from pages.login_page import LoginPage
+
+# Name of the pytest-xdist worker running this process ("gw0" when not distributed)
+WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+
+# Chromium switches that skip features the headless banking tests never use
+LAUNCH_ARGS = [
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--no-zygote",
+]
+
+# Page each cached role starts on once its storage state is loaded
+ROLE_LANDING_URLS = {
+    "manager": APP_URL + "#/manager",
+    "customer": APP_URL + "#/account",
+}
+
+# Options every context needs; browser_context_args adds the home snapshot on top
+BASE_CONTEXT_ARGS = {"base_url": APP_URL}
+
+# Persistent browser profiles used with --reuse-browser, one per xdist worker.
+# Safe to delete if a profile ends up in a bad state.
+PROFILE_DIR = Path(__file__).parent / ".pw_profile"
+
+# Resource types the headless assertions never look at
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+
+# On-disk cache of GET responses, shared by all workers and test runs.
+# Only used with --response-cache, since it freezes the app at the copy first
+# downloaded; delete the directory to pick up a new deployment.
+CACHE_DIR = Path(__file__).parent / ".pw_cache"
+
+# Set from the --response-cache option in pytest_configure
+USE_RESPONSE_CACHE = False
+
+def fulfill_from_cache(route):
+    """Serve a GET request from the response cache, filling it on a miss."""
+    key = hashlib.sha1(route.request.url.encode()).hexdigest()
+    body_path = CACHE_DIR / key
+    meta_path = CACHE_DIR / f"{key}.json"
+    if body_path.exists() and meta_path.exists():
+        meta = json.loads(meta_path.read_text())
+        route.fulfill(status=meta["status"], content_type=meta["content_type"], body=body_path.read_bytes())
+        return
+
+    try:
+        response = route.fetch()
+    except PlaywrightError as error:
+        # Fail the request the way the network would instead of leaving it hanging
+        logging.warning("Fetching %s failed: %s", route.request.url, error)
+        route.abort()
+        return
+    if response.ok:
+        CACHE_DIR.mkdir(exist_ok=True)
+        # Write through a worker-specific temp file so parallel workers never
+        # read a half-written entry
+        tmp_path = CACHE_DIR / f"{key}.{WORKER_ID}.tmp"
+        tmp_path.write_bytes(response.body())
+        os.replace(tmp_path, body_path)
+        meta = {"status": response.status, "content_type": response.headers.get("content-type", "")}
+        tmp_path.write_text(json.dumps(meta))
+        os.replace(tmp_path, meta_path)
+    route.fulfill(response=response)
+
+def install_routes(context, block_assets=True):
+    """Route every request made by a context through the suite's handlers.
+
+    Fonts, images, media, stylesheets and analytics are aborted unless
+    ``block_assets`` is False. With ``--response-cache`` GET requests are
+    served from the response cache; anything else goes to the network.
+    """
+    def handle_route(route):
+        request = route.request
+        if block_assets and (request.resource_type in BLOCKED_RESOURCE_TYPES or "analytics" in request.url):
+            route.abort()
+        elif USE_RESPONSE_CACHE and request.method == "GET":
+            fulfill_from_cache(route)
+        else:
+            route.continue_()
+    context.route("**/*", handle_route)
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--reuse-browser",
+        action="store_true",
+        default=False,
+        help="Run the shared context in a persistent profile kept between test runs",
+    )
+    parser.addoption(
+        "--response-cache",
+        action="store_true",
+        default=False,
+        help="Serve GET responses from the on-disk cache in .pw_cache/, kept between test runs",
+    )
+
+def pytest_configure(config):
+    """Configure logging and the response cache once at session start instead of per test."""
+    global USE_RESPONSE_CACHE
+    logging.getLogger().setLevel(logging.INFO)
+    USE_RESPONSE_CACHE = config.getoption("response_cache")
 
 @pytest.hookimpl(tryfirst=True)
 def pytest_runtest_setup(item):
     """Called before each test is run."""
-    logging.info(f"STARTING TEST: {item.name}")
+    logging.info("STARTING TEST: %s", item.name)
     
 @pytest.hookimpl(trylast=True)
 def pytest_runtest_teardown(item):
     """Called after each test is completed."""
-    logging.info(f"FINISHED TEST: {item.name}\n" + "-"*80)
+    logging.info("FINISHED TEST: %s\n%s", item.name, "-"*80)
 
-@pytest.hookimpl(hookwrapper=True)
-def pytest_runtest_makereport(item, call):
-    """Generate a report for each test phase (setup, call, teardown)."""
-    outcome = yield
-    report = outcome.get_result()
+def pytest_runtest_logreport(report):
+    """Log the outcome of each test once its call phase has been reported."""
+    # Only log the outcome after the test execution (call phase)
+    if report.when != "call":
+        return
     
-    if report.when == "call":
-        # Only log the outcome after the test execution (call phase)
-        if report.passed:
-            logging.info(f"TEST PASSED: {item.name}")
-        elif report.failed:
-            logging.error(f"TEST FAILED: {item.name}")
-            if hasattr(report, "longrepr"):
-                logging.error(f"ERROR DETAILS: {report.longreprtext}")
-        elif report.skipped:
-            logging.info(f"TEST SKIPPED: {item.name}")
+    name = report.nodeid.split("::")[-1]
+    if report.passed:
+        logging.info("TEST PASSED: %s", name)
+    elif report.failed:
+        logging.error("TEST FAILED: %s", name)
+        if hasattr(report, "longrepr"):
+            logging.error("ERROR DETAILS: %s", report.longreprtext)
+    elif report.skipped:
+        logging.info("TEST SKIPPED: %s", name)
 
 @pytest.hookimpl(trylast=True)
 def pytest_sessionfinish(session, exitstatus):
     """Called after the test session is completed."""
     outcome = "PASSED" if exitstatus == 0 else "FAILED"
-    logging.info(f"TEST SESSION COMPLETE - Status: {outcome}")
-    logging.info(f"Total test count: {session.testscollected}")
-    logging.info(f"Passed test count: {session.testscollected - session.testsfailed}")
-    logging.info(f"Failed test count: {session.testsfailed}")
+    logging.info("TEST SESSION COMPLETE - Status: %s", outcome)
+    logging.info("Total test count: %s", session.testscollected)
+    logging.info("Passed test count: %s", session.testscollected - session.testsfailed)
+    logging.info("Failed test count: %s", session.testsfailed)
 
 @pytest.fixture(scope="session")
-def browser_type():
-    """Launch the browser only once per session."""
+def playwright():
+    """Start the Playwright driver once for the session."""
     with sync_playwright() as playwright:
-        # Using Chromium by default but could be configured to use other browsers
-        browser_type = playwright.chromium
-        yield browser_type
+        yield playwright
 
 @pytest.fixture(scope="session")
-def browser(browser_type):
-    """Create a shared browser instance for all tests."""
-    browser = browser_type.launch(headless=True)
+def browser(playwright):
+    """Launch one shared browser for the session.
+
+    Under pytest-xdist session fixtures are created once per worker, so each
+    worker launches a single Chromium rather than one per test.
+    """
+    logging.info("Launching Chromium for worker %s", WORKER_ID)
+    # Headless launches use the lightweight chromium-headless-shell build
+    browser = playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
     yield browser
     browser.close()
 
-@pytest.fixture(scope="function")
-def context(browser):
-    """Create a new browser context for each test function."""
-    context = browser.new_context()
+@pytest.fixture(scope="session")
+def browser_context_args(home_state):
+    """Options applied to every browser context the suite creates.
+
+    Contexts start from the ``home_state`` snapshot, so the app's storage is
+    already in place on the first navigation.
+    """
+    return {**BASE_CONTEXT_ARGS, "storage_state": home_state}
+
+def save_storage_state(browser, path, setup):
+    """Run a setup flow from the home page in a throwaway context and save its storage state."""
+    context = browser.new_context(**BASE_CONTEXT_ARGS)
+    install_routes(context)
+    login_page = LoginPage(context.new_page())
+    login_page.navigate_to(BASE_URL)
+    setup(login_page)
+    context.storage_state(path=path)
+    context.close()
+    return path
+
+@pytest.fixture(scope="session")
+def home_state(browser, tmp_path_factory):
+    """Load the app once and save the storage state it leaves behind.
+
+    With ``--response-cache``, waiting for the network to go idle also fills
+    the cache, so later navigations to the home page are served from disk.
+    """
+    path = tmp_path_factory.mktemp("storage_state") / "home.json"
+    return save_storage_state(
+        browser, path,
+        lambda login_page: login_page.page.wait_for_load_state("networkidle"),
+    )
+
+@pytest.fixture(scope="session")
+def context(request, playwright):
+    """Create one browser context shared by every test in the session.
+
+    The context is created with ``browser_context_args``. Tests must
+    not rely on cookies or permissions carrying over from an earlier test;
+    they are reset by the ``clean_context`` fixture.
+
+    With ``--reuse-browser`` the context instead runs in a persistent profile
+    under ``.pw_profile/<worker>``, so its HTTP cache and local storage carry
+    over to the next run. A separate browser is then only launched for tests
+    marked ``isolated`` or ``needs_assets``.
+    """
+    if request.config.getoption("reuse_browser"):
+        logging.info("Using persistent profile for worker %s", WORKER_ID)
+        context = playwright.chromium.launch_persistent_context(
+            PROFILE_DIR / WORKER_ID, headless=True, args=LAUNCH_ARGS, **BASE_CONTEXT_ARGS,
+        )
+    else:
+        browser = request.getfixturevalue("browser")
+        context = browser.new_context(**request.getfixturevalue("browser_context_args"))
+    install_routes(context)
     yield context
     context.close()
 
 @pytest.fixture(scope="function")
-def page(context):
-    """Create a new page for each test."""
+def clean_context(context):
+    """Reset the shared context before handing it to a test."""
+    context.clear_cookies()
+    context.clear_permissions()
+    yield context
+
+@pytest.fixture(scope="session")
+def manager_state(browser, tmp_path_factory):
+    """Log in as the bank manager once and return the saved storage state."""
+    path = tmp_path_factory.mktemp("storage_state") / "manager.json"
+    return save_storage_state(
+        browser, path,
+        lambda login_page: login_page.manager_login(),
+    )
+
+@pytest.fixture(scope="session")
+def customer_state(browser, tmp_path_factory):
+    """Return a function giving the saved storage state for a customer.
+
+    Each customer is logged in at most once per session.
+    """
+    state_dir = tmp_path_factory.mktemp("storage_state")
+    states = {}
+
+    def get_state(customer_name):
+        if customer_name not in states:
+            path = state_dir / f"customer-{customer_name.replace(' ', '_')}.json"
+            states[customer_name] = save_storage_state(
+                browser, path,
+                lambda login_page: login_page.customer_login(customer_name),
+            )
+        return states[customer_name]
+
+    return get_state
+
+@pytest.fixture(scope="session")
+def role_contexts(browser):
+    """Logged-in contexts keyed by role, created on first use.
+
+    Depends on ``browser`` so the contexts are closed before the browser and
+    the Playwright driver shut down.
+    """
+    contexts = {}
+    yield contexts
+    for context in contexts.values():
+        context.close()
+
+def get_role_context(request, role, customer_name=None):
+    """Return the shared logged-in context for a ``role`` marker."""
+    if role not in ROLE_LANDING_URLS:
+        raise ValueError(f"Unknown role {role!r}, expected one of {sorted(ROLE_LANDING_URLS)}")
+    if role == "customer" and not customer_name:
+        raise ValueError('A customer role needs a name, e.g. @pytest.mark.role("customer", "Harry Potter")')
+    contexts = request.getfixturevalue("role_contexts")
+    key = (role, customer_name)
+    if key not in contexts:
+        if role == "manager":
+            state = request.getfixturevalue("manager_state")
+        else:
+            state = request.getfixturevalue("customer_state")(customer_name)
+        browser = request.getfixturevalue("browser")
+        contexts[key] = browser.new_context(**BASE_CONTEXT_ARGS, storage_state=state)
+        install_routes(contexts[key])
+    return contexts[key]
+
+@pytest.fixture(scope="function")
+def page(request):
+    """Create a new page for each test.
+
+    Tests marked with ``@pytest.mark.isolated`` get a page in a brand new
+    context instead of the shared one; ``@pytest.mark.needs_assets`` does the
+    same but leaves images, fonts and stylesheets unblocked. Tests marked with
+    ``@pytest.mark.role("manager")`` or ``@pytest.mark.role("customer", name)``
+    get a page that starts already logged in as that role; with
+    ``--reuse-browser`` they use the persistent context instead and log in
+    through the UI, so no second browser is launched for them. The shared
+    context is only set up for tests that end up using it.
+    """
+    role = request.node.get_closest_marker("role")
+    needs_assets = request.node.get_closest_marker("needs_assets")
+    if needs_assets or request.node.get_closest_marker("isolated"):
+        browser = request.getfixturevalue("browser")
+        isolated_context = browser.new_context(**request.getfixturevalue("browser_context_args"))
+        install_routes(isolated_context, block_assets=not needs_assets)
+        page = isolated_context.new_page()
+        yield page
+        page.close()
+        isolated_context.close()
+    elif role and not request.config.getoption("reuse_browser"):
+        page = get_role_context(request, *role.args).new_page()
+        page.goto(ROLE_LANDING_URLS[role.args[0]], wait_until="domcontentloaded")
+        yield page
+        page.close()
+    else:
+        page = request.getfixturevalue("clean_context").new_page()
+        yield page
+        page.close()
+
+@pytest.fixture(scope="class")
+def class_page(context):
+    """Create one page shared by every test method in a class.
+
+    Use this instead of ``page`` for multi-step scenarios that should keep
+    their page state between test methods. The page lives in the shared
+    context and ignores the ``role``, ``isolated`` and ``needs_assets``
+    markers. Build page objects on it directly; the ``login_page``,
+    ``customer_page`` and ``manager_page`` fixtures are bound to ``page``.
+    """
     page = context.new_page()
     yield page
-    page.close() 
\ No newline at end of file
+    page.close()
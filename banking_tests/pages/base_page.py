@@ -1,14 +1,26 @@
 from playwright.sync_api import Page, expect
 
+APP_URL = "https://www.globalsqa.com/angularJs-protractor/BankingProject/"
+# Route of the home page, relative to APP_URL
+LOGIN_ROUTE = "#/login"
+BASE_URL = APP_URL + LOGIN_ROUTE
+
 class BasePage:
     """Base page object containing common methods and utilities."""
     
+    __slots__ = ('page',)
+    
     def __init__(self, page: Page):
         self.page = page
         
-    def navigate_to(self, url: str):
-        """Navigate to a specific URL."""
-        self.page.goto(url)
+    def navigate_to(self, url: str, wait_until="domcontentloaded"):
+        """Navigate to a specific URL.
+        
+        Waits only for the DOM by default; later actions auto-wait for the
+        elements they need. Pass ``wait_until="load"`` to wait for every
+        subresource as well.
+        """
+        self.page.goto(url, wait_until=wait_until)
         
     def get_text(self, selector: str) -> str:
         """Get text content of an element."""
@@ -1,5 +1,11 @@
+import re
+from playwright.sync_api import Page, expect
 from pages.base_page import BasePage
 
+# Matches both the success and the insufficient-funds withdrawal messages
+_WITHDRAWAL_RESULT_RE = re.compile(r"Transaction (successful|Failed)", re.IGNORECASE)
+_ACCT_RE = re.compile(r'(\d+)')
+
 class CustomerPage(BasePage):
     """Page object for the customer account page."""
     
@@ -14,13 +20,31 @@ class CustomerPage(BasePage):
     TRANSACTIONS_TAB = "button[ng-click='transactions()']"
     AMOUNT_INPUT = "input[placeholder='amount']"
     DEPOSIT_BTN = "form button[type='submit']:text('Deposit')"
-    WITHDRAW_BTN = "form button.btn.btn-default:text('Withdraw')"
+    WITHDRAW_BTN = "form button.btn:has-text('Withdraw')"
     MESSAGE = "span.error"
     ACCOUNTS_DROPDOWN = "#accountSelect"
     TRANSACTIONS_TABLE = "table.table"
     TRANSACTION_ROWS = "table.table tbody tr"
     TRANSACTION_AMOUNT_CELLS = "table.table tbody tr td:nth-child(2)"
+    AMOUNT_CELL = "td:nth-child(2)"
+    TRANSACTION_TYPE_CELL = "td:nth-child(3)"
     SORT_BY_DATE_BTN = "a[ng-click*='sortType = \\'date\\'']"
+    CUSTOMER_SELECT = "#userSelect"
+    HOME_CUSTOMER_LOGIN_BTN = "button[ng-click='customer()']"
+    
+    def __init__(self, page: Page):
+        super().__init__(page)
+        # Locators are lazy, so build the ones used on every transaction once
+        self._balance = page.locator(self.BALANCE)
+        self._account_number = page.locator(self.ACCOUNT_NUMBER)
+        self._amount_input = page.locator(self.AMOUNT_INPUT)
+        self._deposit_btn = page.locator(self.DEPOSIT_BTN)
+        self._withdraw_btn = page.locator(self.WITHDRAW_BTN)
+        self._message = page.locator(self.MESSAGE)
+        self._accounts_dropdown = page.locator(self.ACCOUNTS_DROPDOWN)
+        self._transaction_rows = page.locator(self.TRANSACTION_ROWS)
+        # Account dropdown contents, read once and reused until logout
+        self._accounts_cache = None
     
     def get_welcome_message(self) -> str:
         """Get the welcome message text."""
@@ -28,18 +52,24 @@ class CustomerPage(BasePage):
     
     def get_balance(self) -> int:
         """Get the current account balance."""
-        balance_text = self.get_text(self.BALANCE)
+        balance_text = self._balance.text_content()
         return int(balance_text)
     
+    def expect_balance(self, expected: int, timeout=5000):
+        """Expect the account balance to equal a value, retrying until it updates."""
+        expect(self._balance).to_have_text(str(expected), timeout=timeout)
+    
+    def expect_account_number(self, timeout=5000) -> str:
+        """Expect an account number to be shown, retrying until it loads, and return it."""
+        expect(self._account_number).to_have_text(_ACCT_RE, timeout=timeout)
+        return self.get_account_number()
+    
     def get_account_number(self) -> str:
         """Get the current account number."""
-        account_text = self.get_text(self.ACCOUNT_NUMBER)
+        account_text = self._account_number.text_content()
         # Extract just the account number from text like "Account Number : 1004 ,"
-        import re
-        match = re.search(r'(\d+)', account_text)
-        if match:
-            return match.group(1)
-        return account_text
+        match = _ACCT_RE.search(account_text)
+        return match.group(1) if match else account_text
     
     def logout(self, return_to_home=False):
         """Log out from customer account.
@@ -48,129 +78,128 @@ class CustomerPage(BasePage):
             return_to_home (bool): If True, navigates to home page after logout.
                                    If False, stays on customer selection screen.
         """
+        self._accounts_cache = None
+        
         # Click logout button
         self.page.wait_for_selector(self.LOGOUT_BTN, state="visible", timeout=5000)
         self.click(self.LOGOUT_BTN)
-        self.page.wait_for_timeout(1000)  # Wait for logout to complete
+        # Logout is complete once the customer selection screen is shown
+        self.page.locator(self.CUSTOMER_SELECT).wait_for(state="visible")
         
         # After logout, optionally click Home button to return to main page
         if return_to_home:
             home_button = self.page.locator('button.btn.home')
             if home_button.is_visible():
                 home_button.click()
-                self.page.wait_for_timeout(1000)  # Wait for home page to load
+                self.page.locator(self.HOME_CUSTOMER_LOGIN_BTN).wait_for(state="visible")
     
     def perform_deposit(self, amount: int):
         """Deposit funds into the account."""
         self.click(self.DEPOSIT_TAB)
-        self.page.wait_for_timeout(1000)  # Wait for deposit tab to be active
-        self.fill(self.AMOUNT_INPUT, str(amount))
-        self.click(self.DEPOSIT_BTN)
-        self.page.wait_for_timeout(1000)  # Wait for deposit to process
+        self._deposit_btn.wait_for(state="visible")  # Deposit tab is active
+        self._amount_input.fill(str(amount))
+        self._deposit_btn.click()
+        # The deposit has been processed once the confirmation message appears
+        expect(self._message).to_contain_text("successful", ignore_case=True, timeout=3000)
     
     def perform_withdrawal(self, amount: int):
         """Withdraw funds from the account."""
         self.click(self.WITHDRAW_TAB)
-        self.page.wait_for_timeout(1000)  # Wait for withdrawal tab to be active
+        self._withdraw_btn.wait_for(state="visible")  # Withdrawal tab is active
         
-        # Clear the input field first to ensure clean entry
-        self.page.locator(self.AMOUNT_INPUT).clear()
-        self.fill(self.AMOUNT_INPUT, str(amount))
+        # fill() replaces any existing value, so no separate clear is needed
+        self._amount_input.fill(str(amount))
+        self._withdraw_btn.click()
         
-        # Ensure we're clicking the visible button with correct text
-        if self.page.locator(self.WITHDRAW_BTN).is_visible():
-            self.page.locator(self.WITHDRAW_BTN).click()
-        else:
-            # Fallback to less specific selector if our specific one fails
-            self.page.locator("button:text('Withdraw')").click()
-        
-        # Wait for withdrawal to process and UI to update
-        self.page.wait_for_timeout(1000)
+        # The withdrawal has been processed once either outcome message appears
+        expect(self._message).to_have_text(_WITHDRAWAL_RESULT_RE, timeout=3000)
         
         # Return true if the message contains "successful"
-        message_element = self.page.locator(self.MESSAGE)
-        if message_element.is_visible():
-            message_text = message_element.text_content()
-            return "successful" in message_text.lower()
-        return False
+        message_text = self._message.text_content()
+        return "successful" in message_text.lower()
     
     def get_message(self) -> str:
         """Get the transaction message."""
-        return self.get_text(self.MESSAGE)
+        return self._message.text_content()
+    
+    def _query_accounts(self) -> dict:
+        """Read the account dropdown in one call and cache it until logout."""
+        if self._accounts_cache is None:
+            self._accounts_cache = self._accounts_dropdown.evaluate("""el => ({
+                count: el.options.length,
+                selected: el.selectedIndex,
+                texts: Array.from(el.options).map(o => o.text)
+            })""")
+        return self._accounts_cache
+    
+    def _select_account_index(self, index: int):
+        """Select the account at a dropdown index and wait for it to be shown."""
+        self._accounts_dropdown.select_option(index=index)
+        self._accounts_cache['selected'] = index
+        # Balances can be equal across accounts, so wait on the account number
+        expect(self._account_number).to_contain_text(self._accounts_cache['texts'][index].strip())
     
     def has_multiple_accounts(self) -> bool:
         """Check if customer has multiple accounts."""
-        dropdown = self.page.locator(self.ACCOUNTS_DROPDOWN)
-        options = dropdown.evaluate("el => Array.from(el.options).map(o => o.value)")
-        return len(options) > 1
+        return self._query_accounts()['count'] > 1
     
     def select_different_account(self):
         """Select a different account from the dropdown."""
-        dropdown = self.page.locator(self.ACCOUNTS_DROPDOWN)
-        
-        # Get all options with their index and text
-        options = dropdown.evaluate("""el => {
-            const selectedIndex = el.selectedIndex;
-            return Array.from(el.options).map((opt, index) => { 
-                return { 
-                    text: opt.text, 
-                    index: index,
-                    selected: index === selectedIndex
-                }; 
-            });
-        }""")
+        accounts = self._query_accounts()
         
-        # Filter out the currently selected option
-        other_options = [opt for opt in options if not opt['selected']]
-        
-        if other_options:
-            # Select the first different account by index
-            dropdown.select_option(index=other_options[0]['index'])
-            self.page.wait_for_timeout(500)
+        # Select the first account that is not currently selected
+        for index in range(accounts['count']):
+            if index != accounts['selected']:
+                self._select_account_index(index)
+                break
     
     def select_account_by_number(self, account_number: str):
         """Select a specific account by account number."""
-        dropdown = self.page.locator(self.ACCOUNTS_DROPDOWN)
-        # Use index or label instead of value, as the account number might not be the value
-        # Get all options and find the one with text containing the account number
-        options = dropdown.evaluate("""el => {
-            return Array.from(el.options).map((opt, index) => { 
-                return { 
-                    text: opt.text, 
-                    index: index
-                }; 
-            });
-        }""")
-        
-        # Find the option that contains the account number in its text
-        for option in options:
-            if account_number in option['text']:
-                dropdown.select_option(index=option['index'])
-                break      
+        # Use index instead of value, as the account number might not be the value
+        for index, text in enumerate(self._query_accounts()['texts']):
+            if account_number in text:
+                self._select_account_index(index)
+                break
 
     def go_to_transactions(self):
         """Navigate to the Transactions tab."""
         self.click(self.TRANSACTIONS_TAB)
-        self.page.wait_for_timeout(1000)  # Wait for transactions to load
+        self.page.locator(self.TRANSACTIONS_TABLE).wait_for(state="visible")
 
     def sort_transactions_by_date(self):
         """Sort transactions by date (newest first)."""
+        # AngularJS re-renders the table inside the click's digest, so the
+        # rows are already sorted when the click returns
         self.click(self.SORT_BY_DATE_BTN)
-        self.page.wait_for_timeout(1000)  # Wait for sorting to complete
+
+    @property
+    def transaction_rows(self):
+        """Locator for the rows of the transactions table."""
+        return self._transaction_rows
+
+    def transactions_with_amount(self, amount: int, transaction_type: str = None):
+        """Locator for the transaction rows whose amount is exactly ``amount``.
+        
+        Args:
+            transaction_type (str): If given, only rows of this type
+                                    ("Credit" or "Debit") are matched.
+        """
+        amount_cell = self.page.locator(self.AMOUNT_CELL, has_text=re.compile(rf"^\s*{amount}\s*$"))
+        rows = self._transaction_rows.filter(has=amount_cell)
+        if transaction_type is not None:
+            type_cell = self.page.locator(self.TRANSACTION_TYPE_CELL, has_text=re.compile(rf"^\s*{transaction_type}\s*$"))
+            rows = rows.filter(has=type_cell)
+        return rows
 
     def get_transactions_count(self) -> int:
         """Get the number of transaction rows in the table."""
-        rows = self.page.locator(self.TRANSACTION_ROWS)
-        return rows.count()
+        return self._transaction_rows.count()
     
-    def get_transaction_amounts(self) -> list:
-        """Get all transaction amounts as a list of strings."""
+    def get_transaction_amounts(self, limit=10) -> list:
+        """Get the first ``limit`` transaction amounts as a list of strings."""
+        # Read the cells in a single round-trip and slice in the page, so only
+        # the rows we need are sent back
         cells = self.page.locator(self.TRANSACTION_AMOUNT_CELLS)
-        count = cells.count()
-        amounts = []
-        
-        for i in range(count):
-            amount_text = cells.nth(i).text_content().strip()
-            amounts.append(amount_text)
-        
-        return amounts 
\ No newline at end of file
+        return cells.evaluate_all(
+            "(els, n) => els.slice(0, n).map(e => e.textContent.trim())", limit
+        )
\ No newline at end of file
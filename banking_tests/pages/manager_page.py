@@ -1,9 +1,16 @@
 from pages.base_page import BasePage
+from playwright.sync_api import expect
+import logging
 import re
 
+# The dialog shows: "Account created successfully with account Number :" followed by the account number
+_ACCOUNT_RE = re.compile(r"Account created successfully with account Number :(\d+)")
+
 class ManagerPage(BasePage):
     """Page object for the bank manager page."""
     
+    __slots__ = ('_rows', '_first_name_input', '_last_name_input', '_post_code_input', 'account_number')
+    
     # Selectors
     ADD_CUSTOMER_TAB = "button[ng-click='addCust()']"
     OPEN_ACCOUNT_TAB = "button[ng-click='openAccount()']"
@@ -20,36 +27,100 @@ class ManagerPage(BasePage):
     DELETE_BUTTON = "button:text('Delete')"
     SEARCH_CUSTOMER = "input[placeholder='Search Customer']"
     
+    # Routes shown while each tab is open
+    ADD_CUSTOMER_ROUTE = "#/manager/addCust"
+    OPEN_ACCOUNT_ROUTE = "#/manager/openAccount"
+    CUSTOMERS_ROUTE = "#/manager/list"
+    
+    def __init__(self, page):
+        super().__init__(page)
+        # Reused by every customer-list lookup
+        self._rows = page.locator(self.CUSTOMER_ROWS)
+        # Add Customer form fields, resolved once per page
+        self._first_name_input = page.locator(self.FIRST_NAME_INPUT)
+        self._last_name_input = page.locator(self.LAST_NAME_INPUT)
+        self._post_code_input = page.locator(self.POST_CODE_INPUT)
+    
     def go_to_add_customer(self):
-        """Navigate to the Add Customer tab."""
-        self.click(self.ADD_CUSTOMER_TAB)
+        """Navigate to the Add Customer tab, unless it is already open."""
+        if not self._on_tab(self.ADD_CUSTOMER_ROUTE):
+            self.click(self.ADD_CUSTOMER_TAB)
     
     def go_to_open_account(self):
-        """Navigate to the Open Account tab."""
-        self.click(self.OPEN_ACCOUNT_TAB)
+        """Navigate to the Open Account tab, unless it is already open."""
+        if not self._on_tab(self.OPEN_ACCOUNT_ROUTE):
+            self.click(self.OPEN_ACCOUNT_TAB)
     
     def go_to_customers_list(self):
-        """Navigate to the Customers tab."""
-        self.click(self.CUSTOMERS_TAB)
+        """Navigate to the Customers tab, unless it is already open."""
+        if not self._on_tab(self.CUSTOMERS_ROUTE):
+            self.click(self.CUSTOMERS_TAB)
+    
+    def _on_tab(self, route: str) -> bool:
+        """Check if the tab shown at the given route is already open."""
+        return self.page.url.endswith(route)
     
-    def add_customer(self, first_name: str, last_name: str, post_code: str):
-        """Add a new customer."""
+    def customer_row(self, customer_name: str):
+        """Get a locator for the customer rows matching a name.
+        
+        A full name matches rows whose first and last name cells equal its
+        two parts; a single name matches rows with a cell equal to it. Exact
+        matching keeps "Smith" from also matching "Smithson". Pair it with
+        ``expect(...).to_have_count()`` to wait for a customer to appear or
+        disappear.
+        """
+        rows = self._rows
+        for part in customer_name.split(" ", 1):
+            rows = rows.filter(has=self.page.get_by_text(part, exact=True))
+        return rows
+    
+    def _search_customers(self, text: str):
+        """Type into the customer search box and wait for the table to filter.
+        
+        The filter has been applied once no rendered row is missing the search
+        text, which settles as soon as AngularJS re-renders the table.
+        """
+        self.fill(self.SEARCH_CUSTOMER, text)
+        expect(self._rows.filter(has_not_text=text)).to_have_count(0, timeout=2000)
+    
+    def add_customer(self, first_name: str, last_name: str, post_code: str, batch_fill=True):
+        """Add a new customer.
+        
+        Args:
+            batch_fill (bool): If True, fills the whole form in one JS call.
+                               If False, fills each field through Playwright,
+                               which is easier to follow when debugging.
+        """
         self.go_to_add_customer()
         
         # Wait for form fields to be visible
-        self.page.wait_for_selector(self.FIRST_NAME_INPUT, state="visible", timeout=2000)
-        self.fill(self.FIRST_NAME_INPUT, first_name)
-        self.fill(self.LAST_NAME_INPUT, last_name)
-        self.fill(self.POST_CODE_INPUT, post_code)
+        self._first_name_input.wait_for(state="visible", timeout=2000)
+        if batch_fill:
+            fields = [
+                (self.FIRST_NAME_INPUT, first_name),
+                (self.LAST_NAME_INPUT, last_name),
+                (self.POST_CODE_INPUT, post_code),
+            ]
+            # Set every value and fire the input event AngularJS listens for
+            self.page.evaluate("""fields => fields.forEach(([selector, value]) => {
+                const el = document.querySelector(selector);
+                el.value = value;
+                el.dispatchEvent(new Event('input', { bubbles: true }));
+            })""", fields)
+        else:
+            self._first_name_input.fill(first_name)
+            self._last_name_input.fill(last_name)
+            self._post_code_input.fill(post_code)
         
-        # Set up dialog handler before clicking
+        # Accept the confirmation alert as soon as it opens
         self.page.once("dialog", lambda dialog: dialog.accept())
         
-        # Submit the form
-        self.click(self.ADD_CUSTOMER_BTN)
+        # Submit the form and block until the alert has been raised
+        with self.page.expect_event("dialog"):
+            self.click(self.ADD_CUSTOMER_BTN)
         
-        # Wait for the operation to complete
-        self.page.wait_for_timeout(1000)
+        # The form is reset once the customer has been added
+        expect(self._first_name_input).to_have_value("", timeout=2000)
     
     def open_account(self, customer_name: str, currency: str):
         """Open a new account for a customer with specified currency."""
@@ -59,118 +130,52 @@ class ManagerPage(BasePage):
         self.select_option(self.CUSTOMER_SELECT, customer_name)
         self.select_option(self.CURRENCY_SELECT, currency)
         
-        # Initialize account number
-        self.account_number = None
-        
-        # Set up dialog handler before clicking
-        def handle_dialog(dialog):
-            # Log the actual dialog message for debugging
-            print(f"Dialog message: {dialog.message}")
-            
-            # Set a default account number in case we can't extract it
-            self.account_number = "unknown"
-                
-            # The dialog shows: "Account created successfully with account Number :" followed by the account number
-            pattern = r"Account created successfully with account Number :(\d+)"
-            
-            # Extract the account number using the pattern
-            match = re.search(pattern, dialog.message)
-            if match:
-                self.account_number = match.group(1)
-                
-            dialog.accept()
-            
-        self.page.once("dialog", handle_dialog)
-        
-        # Process the account creation
-        self.click(self.PROCESS_BTN)
-        self.page.wait_for_timeout(500)  # Increased wait time for dialog processing
-        
-        # Return the account number captured from the dialog
-        return getattr(self, 'account_number', None)
+        # Accept the alert as soon as it opens; left unhandled it would keep
+        # the click below from returning
+        self.page.once("dialog", lambda dialog: dialog.accept())
+        
+        # Process the account creation and capture the dialog it raises
+        with self.page.expect_event("dialog") as dialog_info:
+            self.click(self.PROCESS_BTN)
+        
+        # Log the dialog message so a missing account number can be traced
+        message = dialog_info.value.message
+        logging.info("Dialog message: %s", message)
+        
+        # Extract the account number, with a default in case it is missing
+        match = _ACCOUNT_RE.search(message)
+        self.account_number = match.group(1) if match else "unknown"
+        return self.account_number
     
     def delete_customer(self, customer_name: str):
         """Delete a customer by name."""
         self.go_to_customers_list()
         
-        # Wait for the table to be fully loaded
-        self.page.wait_for_selector(self.CUSTOMERS_TABLE, state="visible", timeout=2000)
-        
-        # Handle full name by splitting it into components
-        if " " in customer_name:
-            parts = customer_name.split(" ", 1)
-            first_name = parts[0]
-            last_name = parts[1]
-            
-            # Try searching for the first name as it's usually unique enough
-            self.fill(self.SEARCH_CUSTOMER, first_name)
-            self.page.wait_for_timeout(1000)  # Increased wait time for search results
-            
-            # Find rows that contain the last name
-            rows = self.page.locator(self.CUSTOMER_ROWS)
-            for i in range(rows.count()):
-                row = rows.nth(i)
-                row_text = row.text_content()
-                if last_name in row_text:
-                    # Find delete button within this row
-                    delete_button = row.locator("button:text('Delete')")
-                    if delete_button.count() > 0:
-                        delete_button.click()
-                        self.page.wait_for_timeout(1000)  # Increased wait time for deletion
-                        return True
-        else:
-            # For non-full names, use the original approach
-            self.fill(self.SEARCH_CUSTOMER, customer_name)
-            self.page.wait_for_timeout(1000)
-            
-            rows = self.page.locator(self.CUSTOMER_ROWS)
-            for i in range(rows.count()):
-                row = rows.nth(i)
-                row_text = row.text_content()
-                if customer_name in row_text:
-                    delete_button = row.locator("button:text('Delete')")
-                    if delete_button.count() > 0:
-                        delete_button.click()
-                        self.page.wait_for_timeout(1000)
-                        return True
-        
-        return False
+        # Wait for the table rows to be rendered
+        self._rows.first.wait_for(timeout=2000)
+        
+        # Narrow the table by the first name, then resolve the exactly
+        # matching row and its Delete button in a single selector pass
+        self._search_customers(customer_name.split(" ", 1)[0])
+        delete_button = self.customer_row(customer_name).locator(self.DELETE_BUTTON).first
+        
+        # The search filter has settled, so a missing row can be detected
+        # right away instead of timing out
+        if delete_button.count() == 0:
+            return False
+        
+        delete_button.click()
+        return True
     
     def is_customer_listed(self, customer_name: str):
         """Check if a customer is listed in the customers table."""
         self.go_to_customers_list()
         
-        # Wait for the table to be fully loaded with a longer timeout
-        self.page.wait_for_selector(self.CUSTOMERS_TABLE, state="visible", timeout=2000)
-        
-        # For full name check, we'll try to split it into components
-        # This handles cases where first and last name appear separately in the table
-        if " " in customer_name:
-            parts = customer_name.split(" ", 1)
-            first_name = parts[0]
-            last_name = parts[1]
-            
-            # First try with the original full name
-            table_content = self.page.locator(self.CUSTOMERS_TABLE).text_content()
-            if customer_name in table_content:
-                return True
-                
-            # Try searching for the first name
-            self.fill(self.SEARCH_CUSTOMER, first_name)
-            self.page.wait_for_timeout(1000)  # Increased wait time for search results
-            
-            # Check if any row contains the last name after filtering by first name
-            rows = self.page.locator(self.CUSTOMER_ROWS)
-            for i in range(rows.count()):
-                row_text = rows.nth(i).text_content()
-                if last_name in row_text:
-                    return True
-        else:
-            # If it's not a full name, use the original method
-            self.fill(self.SEARCH_CUSTOMER, customer_name)
-            self.page.wait_for_timeout(1000)  # Increased wait time
-            
-            table_content = self.page.locator(self.CUSTOMERS_TABLE).text_content()
-            return customer_name in table_content
-            
-        return False
\ No newline at end of file
+        # Wait for the table rows to be rendered
+        self._rows.first.wait_for(timeout=2000)
+        
+        # Narrow the table by the first name, then check for the exactly
+        # matching row in a single existence check, the same row
+        # delete_customer would act on
+        self._search_customers(customer_name.split(" ", 1)[0])
+        return self.customer_row(customer_name).count() > 0
\ No newline at end of file
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 import os
 import sys
+import shutil
 import subprocess
 from pathlib import Path
 import json
@@ -21,7 +22,7 @@ def main():
     os.environ["PLAYWRIGHT_JSON_OUTPUT_NAME"] = str(results_dir / "playwright_report.json")
     
     try:
-        # Run the tests
+        # Run the tests; pytest.ini spreads them across one xdist worker per CPU
         test_result = subprocess.run(
             [sys.executable, "-m", "pytest", "test_banking.py", "-v", "-p", "no:cov"], 
             check=False  # Don't raise exception on test failure
@@ -31,8 +32,7 @@ def main():
         json_report_path = script_dir / "test_results.json"
         if json_report_path.exists():
             # Read the JSON report
-            with open(json_report_path, 'r') as f:
-                report_data = json.load(f)
+            report_data = json.loads(json_report_path.read_bytes())
                 
             # Summary stats
             summary = report_data.get('summary', {})
@@ -49,8 +49,7 @@ def main():
             print(f"\nDetailed JSON report saved to: {json_report_path}")
             
             # Copy the report to the results directory for archiving
-            with open(results_dir / "test_results.json", 'w') as f:
-                json.dump(report_data, f, indent=2)
+            shutil.copyfile(json_report_path, results_dir / "test_results.json")
         
         # Return proper exit code based on test results
         if test_result.returncode != 0: